@@ -1,16 +1,31 @@
 
+import io
 import os
+import json
+import errno
 import time
 import shutil
+import asyncio
+import calendar
 import datetime
+import tempfile
+import threading
+import functools
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-import glob
+
+try:
+    import aiohttp
+except ImportError:  # Selenium-only scraping
+    aiohttp = None
 
 # --- Configuration ---
 # Base directory for commodity-wise export data
@@ -24,15 +39,71 @@ TEMP_DOWNLOAD_DIR = os.path.join(BASE_DOWNLOAD_DIR, "temp_downloads")
 # HS Codes file path
 HSCODES_FILE = os.path.join(current_dir,"data","hscodes","hscodes.txt")
 
+# Resume cache: {hscode: "YYYY-MM"}, the last month through which every file is present
+COMPLETED_CACHE_FILE = os.path.join(BASE_DOWNLOAD_DIR, ".completed_hscodes.json")
+
+URL = "https://tradestat.commerce.gov.in/meidb/commodity_wise_all_countries_export"
+
+# Number of parallel headless Chrome instances
+MAX_WORKERS = 6
+
+# Number of simultaneous HTTP requests when submitting the report form directly
+MAX_CONCURRENT_REQUESTS = 20
+
+# Element ids of the report form fields
+FORM_FIELD_IDS = {"hscode": "cwacexHSCODE", "month": "cwacexMonth", "year": "cwacexYear"}
+
+# Month names indexed 1-12 (index 0 is empty), e.g. MONTH_NAMES[4] == "April"
+MONTH_NAMES = list(calendar.month_name)
+
+# Fills in the report form (HS code, month, year) and fires change events
+SET_FORM_VALUES_JS = """
+var ids = ["cwacexHSCODE", "cwacexMonth", "cwacexYear"];
+for (var i = 0; i < ids.length; i++) {
+    var el = document.getElementById(ids[i]);
+    el.value = arguments[i];
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+}
+"""
+
+# First row of the site's Excel export; the second row is the generation date
+REPORT_TITLE = "TradeStat->Meidb->Export->Commoditywise-all-countries"
+
+# Returns what the DataTables Excel button would export ({header, body}),
+# or null if the page has no DataTables/Buttons instance
+EXPORT_DATA_JS = """
+var $ = window.jQuery;
+if (!$ || !$.fn.dataTable) { return null; }
+var tables = $.fn.dataTable.tables({api: true});
+if (!tables.count() || !tables.buttons) { return null; }
+var data = tables.table(0).buttons.exportData();
+return {header: data.header, body: data.body};
+"""
+
 # Ensure directories exist
 if not os.path.exists(TEMP_DOWNLOAD_DIR):
     os.makedirs(TEMP_DOWNLOAD_DIR)
 
-def setup_driver():
+# Each worker thread owns its own driver and download folder
+_worker_state = threading.local()
+_worker_drivers = []
+_worker_drivers_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def get_driver_path():
+    """
+    Returns the chromedriver binary path, resolved once per run.
+    Set the CHROMEDRIVER environment variable to pin a binary and skip
+    webdriver-manager's network version check entirely.
+    """
+    return os.environ.get("CHROMEDRIVER") or ChromeDriverManager().install()
+
+def setup_driver(download_dir=TEMP_DOWNLOAD_DIR):
     """Sets up the Chrome WebDriver with specific download preferences."""
     chrome_options = webdriver.ChromeOptions()
     prefs = {
-        "download.default_directory": TEMP_DOWNLOAD_DIR,
+        "download.default_directory": download_dir,
         "download.prompt_for_download": False,
         "download.directory_upgrade": True,
         "safebrowsing.enabled": True,
@@ -41,50 +112,130 @@ def setup_driver():
     chrome_options.add_experimental_option("prefs", prefs)
     chrome_options.add_argument("--headless=new")
     
-    # Setup driver (this will automatically download/update the driver)
-    service = Service(ChromeDriverManager().install())
+    # Setup driver (the binary is downloaded/updated on first use only)
+    service = Service(get_driver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     
     # Enable downloads in headless mode explicitly
     driver.execute_cdp_cmd("Page.setDownloadBehavior", {
         "behavior": "allow",
-        "downloadPath": TEMP_DOWNLOAD_DIR
+        "downloadPath": download_dir
     })
 
     return driver
 
-def get_latest_file(directory):
-    """Returns the path of the latest file in the directory."""
-    files = glob.glob(os.path.join(directory, "*"))
-    files = [f for f in files if not f.endswith('.crdownload') and not f.endswith('.tmp')]
-    if not files:
-        return None
-    return max(files, key=os.path.getctime)
+def get_worker_driver():
+    """
+    Returns the (driver, download_dir) pair owned by the calling thread,
+    creating them on first use. WebDriver instances must not be shared
+    across threads, and each worker needs its own download folder so
+    downloads from different browsers never mix.
+    """
+    if not hasattr(_worker_state, "driver"):
+        download_dir = os.path.join(TEMP_DOWNLOAD_DIR, threading.current_thread().name)
+        os.makedirs(download_dir, exist_ok=True)
+        _worker_state.download_dir = download_dir
+        _worker_state.driver = setup_driver(download_dir)
+        with _worker_drivers_lock:
+            _worker_drivers.append((_worker_state.driver, download_dir))
+    return _worker_state.driver, _worker_state.download_dir
 
-def is_hscode_completed(hscode_dir, start_year, end_year):
+def wait_for_download(directory, timeout=60):
     """
-    Checks if all expected monthly files for an HS code exist from start_year to end_year.
-    Returns True if the HS code is fully downloaded, False otherwise.
+    Waits for a finished download to appear in an otherwise empty directory.
+    Returns the file path, or None on timeout. Polls with os.scandir using an
+    exponential backoff starting at 50 ms, ignoring in-progress downloads.
     """
-    if not os.path.exists(hscode_dir):
-        return False
+    delay = 0.05
+    deadline = time.time() + timeout
+    
+    while time.time() < deadline:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(('.crdownload', '.tmp')):
+                    return entry.path
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
+    
+    return None
 
-    now = datetime.datetime.now()
+def move_file(src, dst):
+    """
+    Moves src to dst with a single rename (temp folders live under
+    BASE_DOWNLOAD_DIR, so this is normally the same filesystem), falling
+    back to shutil.move only when they are on different devices.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+def wait_for_stable_size(path, checks=3, interval=0.1):
+    """Waits until the file size stops changing (up to `checks` polls)."""
+    size = os.path.getsize(path)
+    for _ in range(checks):
+        time.sleep(interval)
+        new_size = os.path.getsize(path)
+        if new_size == size:
+            return
+        size = new_size
+
+def monthly_filename(year, month):
+    """Returns the target filename for a month: {MonthName}_{Year}.xlsx"""
+    return f"{MONTH_NAMES[month]}_{year}.xlsx"
+
+def expected_months(start_year, end_year, now):
+    """Returns all (year, month) pairs from start_year to end_year, excluding future months."""
+    return [(year, month)
+            for year in range(start_year, end_year + 1)
+            for month in range(1, 13)
+            if not (year == now.year and month > now.month)]
+
+def list_existing_files(hscode_dir):
+    """Returns the set of file names in hscode_dir using a single directory scan."""
+    try:
+        with os.scandir(hscode_dir) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def month_key(year, month):
+    """Returns the resume-cache key for a month, e.g. "2025-04" (sorts chronologically)."""
+    return f"{year:04d}-{month:02d}"
+
+def load_completed_cache():
+    """Loads the {hscode: "YYYY-MM"} resume cache; empty if missing or unreadable."""
+    try:
+        with open(COMPLETED_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_completed_cache(completed):
+    """Writes the resume cache atomically (temp file + os.replace)."""
+    tmp_path = COMPLETED_CACHE_FILE + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(completed, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, COMPLETED_CACHE_FILE)
+
+def missing_months(hscode, start_year, now, completed_through=None):
+    """
+    Returns the (year, month) pairs whose file is not yet downloaded for an
+    HS code. Months up to completed_through ("YYYY-MM") are known to be
+    complete and are not checked again.
+    """
+    months = expected_months(start_year, now.year, now)
+    if completed_through:
+        months = [(year, month) for year, month in months
+                  if month_key(year, month) > completed_through]
+    if not months:
+        return []
     
-    for year in range(start_year, end_year + 1):
-        for month in range(1, 13):
-            # Stop if future date
-            if year == now.year and month > now.month:
-                break
-            
-            month_name = datetime.date(year, month, 1).strftime('%B')
-            target_filename = f"{month_name}_{year}.xlsx"
-            target_path = os.path.join(hscode_dir, target_filename)
-            
-            if not os.path.exists(target_path):
-                return False
-                
-    return True
+    existing = list_existing_files(os.path.join(BASE_DOWNLOAD_DIR, str(hscode)))
+    return [(year, month) for year, month in months
+            if monthly_filename(year, month) not in existing]
 
 def read_hscodes_from_file(filepath):
     """Reads HS codes from a text file (one per line)."""
@@ -101,129 +252,371 @@ def read_hscodes_from_file(filepath):
         print(f"Error: File '{filepath}' not found.")
         return []
 
-def scrape_commodity_data(hscodes):
+def _to_number(cell):
     """
-    Scrapes commodity-wise export data for the given list of HS codes.
+    Converts a displayed numeric string ("1,234.56") to a number, as the
+    site's Excel export does; any other cell is returned unchanged.
+    """
+    if not isinstance(cell, str):
+        return cell
+    text = cell.strip().replace(",", "")
+    try:
+        number = float(text)
+    except ValueError:
+        return cell
+    if number != number or number in (float("inf"), float("-inf")):
+        return cell
+    return int(number) if number.is_integer() and "." not in text else number
+
+def save_report(export_data, staging_path, target_path):
+    """
+    Writes DataTables export data as an .xlsx with the same layout as the
+    site's Excel export (title row, generation row, header row, data rows),
+    so transform_to_long_format_*.py reads it unchanged.
+    Data cells are stored as numbers where they hold one, since the table
+    export yields display strings with thousands separators.
+    """
+    generated = datetime.date.today().strftime('%m/%d/%Y')
+    body = [[_to_number(cell) for cell in row] for row in export_data['body']]
+    rows = [[REPORT_TITLE],
+            [f"Report Generated on: {generated} - Values in US $ Million"],
+            export_data['header']] + body
     
-    Args:
-        hscodes: List of 8-digit HS codes to scrape
+    # Write next to the browser downloads, then move into place so a partial
+    # file never looks like a finished month
+    pd.DataFrame(rows).to_excel(staging_path, header=False, index=False)
+    move_file(staging_path, target_path)
+
+class _FormParser(HTMLParser):
+    """Collects every form on a page with its action, method and default field values."""
+    
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+        self._form = None
+        self._select = None
+        self._select_has_value = False
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._form = {"action": attrs.get("action") or "",
+                          "method": (attrs.get("method") or "get").lower(),
+                          "fields": {}, "ids": {}}
+            self.forms.append(self._form)
+            return
+        if self._form is None:
+            return
+        
+        name = attrs.get("name")
+        if tag in ("input", "select", "textarea") and name:
+            if attrs.get("id"):
+                self._form["ids"][attrs["id"]] = name
+            if tag == "input":
+                input_type = (attrs.get("type") or "text").lower()
+                if input_type in ("submit", "button", "reset", "image"):
+                    return
+                if input_type in ("checkbox", "radio") and "checked" not in attrs:
+                    return
+            self._form["fields"][name] = attrs.get("value") or ""
+            if tag == "select":
+                self._select = name
+                self._select_has_value = False
+        elif tag == "option" and self._select:
+            # Browsers submit the selected option, or the first one if none is selected
+            if "selected" in attrs or not self._select_has_value:
+                self._form["fields"][self._select] = attrs.get("value") or ""
+                self._select_has_value = True
+    
+    def handle_endtag(self, tag):
+        if tag == "select":
+            self._select = None
+        elif tag == "form":
+            self._form = None
+
+def parse_report_form(html, page_url):
+    """
+    Finds the report form in the page HTML.
+    Returns {url, method, fields, names} or None if the form is not present.
+    fields holds default values (including hidden tokens); names maps
+    hscode/month/year to the form's field names.
     """
-    driver = setup_driver()
-    url = "https://tradestat.commerce.gov.in/meidb/commodity_wise_all_countries_export"
+    parser = _FormParser()
+    parser.feed(html)
     
-    start_year = 2018
-    now = datetime.datetime.now()
-    current_year = now.year
+    for form in parser.forms:
+        if all(field_id in form["ids"] for field_id in FORM_FIELD_IDS.values()):
+            return {"url": urljoin(page_url, form["action"]),
+                    "method": form["method"],
+                    "fields": form["fields"],
+                    "names": {key: form["ids"][field_id] for key, field_id in FORM_FIELD_IDS.items()}}
+    return None
 
+def parse_report_table(html):
+    """Returns the report table of a result page as {header, body}, or None if there is none."""
     try:
-        total_hscodes = len(hscodes)
-        print(f"Processing {total_hscodes} HS codes...\n")
+        df = pd.read_html(io.StringIO(html), match="Country")[0]
+    except ValueError:
+        return None
+    if df.empty:
+        return None
+    
+    body = df.astype(object).where(df.notna(), "").values.tolist()
+    return {"header": [str(col) for col in df.columns], "body": body}
+
+async def _fetch_report(session, semaphore, form, hscode, year, month):
+    """
+    Submits the report form for one (hscode, year, month) and saves the result.
+    Returns True if the response contained a report table.
+    """
+    fields = dict(form["fields"])
+    fields[form["names"]["hscode"]] = str(hscode)
+    fields[form["names"]["month"]] = str(month)
+    fields[form["names"]["year"]] = str(year)
+    payload = {"data": fields} if form["method"] == "post" else {"params": fields}
+    
+    async with semaphore:
+        async with session.request(form["method"], form["url"], **payload) as response:
+            response.raise_for_status()
+            html = await response.text()
+    
+    export_data = await asyncio.to_thread(parse_report_table, html)
+    if export_data is None:
+        return False
+    
+    target_filename = monthly_filename(year, month)
+    target_path = os.path.join(BASE_DOWNLOAD_DIR, str(hscode), target_filename)
+    staging_path = os.path.join(TEMP_DOWNLOAD_DIR, f"{hscode}_{target_filename}")
+    await asyncio.to_thread(save_report, export_data, staging_path, target_path)
+    print(f"    [{hscode}] Saved: {target_filename}")
+    return True
+
+async def fetch_all_reports(jobs, max_concurrency=MAX_CONCURRENT_REQUESTS):
+    """
+    Fetches reports by submitting the report form directly over HTTP,
+    without a browser. Returns the jobs that still need the Selenium scraper.
+    """
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        # One GET for the session cookies and any CSRF token in the form
+        async with session.get(URL) as response:
+            response.raise_for_status()
+            form = parse_report_form(await response.text(), str(response.url))
         
-        # Iterate through HS Codes
-        for idx, hscode in enumerate(hscodes, 1):
-            print(f"--- Processing HS Code {idx}/{total_hscodes}: {hscode} ---")
-            
-            # Create HS Code Directory
-            hscode_dir = os.path.join(BASE_DOWNLOAD_DIR, str(hscode))
+        if form is None:
+            print("  Report form not found in page; using the browser scraper.")
+            return jobs
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results = await asyncio.gather(
+            *(_fetch_report(session, semaphore, form, *job) for job in jobs),
+            return_exceptions=True
+        )
+    
+    if not any(result is True for result in results):
+        print("  No report tables in the HTTP responses; using the browser scraper.")
+        return jobs
+    
+    # Pages without a table are months with no data; only failed requests are retried
+    remaining = []
+    for (hscode, year, month), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            print(f"    [{hscode}] HTTP error for {MONTH_NAMES[month]} {year}: {result}")
+            remaining.append((hscode, year, month))
+        elif result is False:
+            print(f"    [{hscode}] No data for {MONTH_NAMES[month]} {year}. Skipping.")
+    
+    return remaining
+
+def _download_one(driver, download_dir, hscode, year, month):
+    """
+    Downloads the report for a single (hscode, year, month) into
+    {BASE_DOWNLOAD_DIR}/{hscode}/{MonthName}_{Year}.xlsx using the given driver.
+    """
+    month_name = MONTH_NAMES[month]
+    target_filename = monthly_filename(year, month)
+    target_path = os.path.join(BASE_DOWNLOAD_DIR, str(hscode), target_filename)
+
+    print(f"  [{hscode}] Downloading for {month_name} {year}...")
+
+    try:
+        # Results render on the same page as the form, so the page only needs
+        # loading once per driver; later months just re-submit the form
+        previous_btns = driver.find_elements(By.CSS_SELECTOR, ".buttons-excel")
+        if not driver.find_elements(By.ID, "cwacexHSCODE"):
+            driver.get(URL)
+            previous_btns = []
             
-            if not os.path.exists(hscode_dir):
-                os.makedirs(hscode_dir)
+            # Wait for page to load
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.ID, "cwacexHSCODE"))
+            )
+        
+        # 1-3. Enter HS Code, Month and Year
+        driver.execute_script(SET_FORM_VALUES_JS, str(hscode), str(month), str(year))
+        
+        # 4. Submit
+        submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
+        driver.execute_script("arguments[0].click();", submit_btn)
+        
+        # 5. Wait for the previous result's Excel Button to go away and the
+        # new one to appear (with delay consideration)
+        try:
+            if previous_btns:
+                WebDriverWait(driver, 20).until(EC.staleness_of(previous_btns[0]))
+            excel_btn = WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".buttons-excel"))
+            )
+        except:
+            print(f"    [{hscode}] No data/button for {month_name} {year}. Skipping.")
+            return
+        
+        # 6. Read the rows the Excel button would export straight from the
+        # table, skipping workbook generation and the download round trip
+        export_data = driver.execute_script(EXPORT_DATA_JS)
+        if export_data:
+            save_report(export_data, os.path.join(download_dir, target_filename), target_path)
+            print(f"    [{hscode}] Saved: {target_filename}")
+            return
+        
+        # Fallback: click Download into a fresh, empty folder so the only
+        # file that can show up there is this report.
+        # Wait until the button is interactive
+        excel_btn = WebDriverWait(driver, 10).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, ".buttons-excel"))
+        )
+        tmp_dir = tempfile.mkdtemp(dir=download_dir)
+        try:
+            driver.execute_cdp_cmd("Page.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": tmp_dir
+            })
+            driver.execute_script("arguments[0].click();", excel_btn)
             
-            # Check if HS code is already completed
-            if is_hscode_completed(hscode_dir, start_year, current_year):
-                print(f"  Skipping {hscode} - All files already downloaded.\n")
-                continue
+            # 7. Wait for download to finish
+            new_file = wait_for_download(tmp_dir)
             
-            # Iterate through Years
-            for year in range(start_year, current_year + 1):
-                # Iterate through Months
-                for month in range(1, 13):
-                    
-                    # Stop if future date
-                    if year == now.year and month > now.month:
-                        break
-                    
-                    # Target Filename: {MonthName}_{Year}.xlsx
-                    month_name = datetime.date(year, month, 1).strftime('%B')
-                    target_filename = f"{month_name}_{year}.xlsx"
-                    target_path = os.path.join(hscode_dir, target_filename)
-                    
-                    # Skip if file already exists (Resumability logic)
-                    if os.path.exists(target_path):
-                        continue
-                    
-                    print(f"  Downloading for {month_name} {year}...")
-                
-                    try:
-                        driver.get(url) 
-                        
-                        # Wait for page to load
-                        WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.ID, "cwacexHSCODE"))
-                        )
-                        
-                        # 1. Enter HS Code
-                        hscode_input = driver.find_element(By.ID, "cwacexHSCODE")
-                        hscode_input.clear()
-                        hscode_input.send_keys(str(hscode))
-                        
-                        # 2. Select Month
-                        Select(driver.find_element(By.ID, "cwacexMonth")).select_by_value(str(month))
-                        
-                        # 3. Select Year
-                        Select(driver.find_element(By.ID, "cwacexYear")).select_by_value(str(year))
-                        
-                        # 4. Submit
-                        submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-                        driver.execute_script("arguments[0].click();", submit_btn)
-                        
-                        # 5. Wait for Excel Button to appear (with delay consideration)
-                        try:
-                            excel_btn = WebDriverWait(driver, 20).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, ".buttons-excel"))
-                            )
-                            # Additional wait to ensure button is fully interactive
-                            time.sleep(2)
-                        except:
-                            print(f"    No data/button for {month_name} {year}. Skipping.")
-                            continue
-                        
-                        # 6. Click Download
-                        driver.execute_script("arguments[0].click();", excel_btn)
-                        
-                        # 7. Wait for download to finish
-                        timeout = 60
-                        start_wait = time.time()
-                        new_file = None
-                        
-                        while time.time() - start_wait < timeout:
-                            latest = get_latest_file(TEMP_DOWNLOAD_DIR)
-                            if latest:
-                                # Check if file was modified after we started waiting
-                                if os.path.getmtime(latest) > start_wait:
-                                    new_file = latest
-                                    break
-                            time.sleep(1)
-                        
-                        if new_file:
-                            # Move and Rename
-                            # Adding a small buffer for file release
-                            time.sleep(1)
-                            shutil.move(new_file, target_path)
-                            print(f"    Saved: {target_filename}")
-                        else:
-                            print("    Download timeout.")
-                            
-                    except Exception as e:
-                        print(f"    Error processing {month_name} {year}: {e}")
-                        # Ensure we reset for next iteration
-                        continue
+            if new_file:
+                # Move and Rename once the browser has finished writing it
+                wait_for_stable_size(new_file)
+                move_file(new_file, target_path)
+                print(f"    [{hscode}] Saved: {target_filename}")
+            else:
+                print(f"    [{hscode}] Download timeout for {month_name} {year}.")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
             
-            print()  # Empty line after each HS code
+    except Exception as e:
+        print(f"    [{hscode}] Error processing {month_name} {year}: {e}")
+
+def _download_job(job):
+    """Thread pool task: runs one (hscode, year, month) job on this worker's driver."""
+    driver, download_dir = get_worker_driver()
+    _download_one(driver, download_dir, *job)
+
+def build_jobs(hscodes, start_year, now, completed):
+    """
+    Returns the list of (hscode, year, month) jobs whose monthly file is not
+    yet downloaded, creating the HS code directories along the way.
+    HS codes found complete are recorded in the completed resume cache.
+    """
+    jobs = []
+    total_hscodes = len(hscodes)
+    current_month = month_key(now.year, now.month)
+    
+    for idx, hscode in enumerate(hscodes, 1):
+        print(f"--- Checking HS Code {idx}/{total_hscodes}: {hscode} ---")
+        
+        # Completed on an earlier run and no new month since: no filesystem access
+        if completed.get(hscode) == current_month:
+            print(f"  Skipping {hscode} - All files already downloaded.")
+            continue
+        
+        # Create HS Code Directory
+        hscode_dir = os.path.join(BASE_DOWNLOAD_DIR, str(hscode))
+        
+        os.makedirs(hscode_dir, exist_ok=True)
+        
+        # Only months after the cached completion point are checked (Resumability logic)
+        pending = missing_months(hscode, start_year, now, completed.get(hscode))
+        
+        # Check if HS code is already completed
+        if not pending:
+            print(f"  Skipping {hscode} - All files already downloaded.")
+            completed[hscode] = current_month
+            continue
+        
+        jobs.extend((hscode, year, month) for year, month in pending)
+    
+    return jobs
+
+def scrape_commodity_data(hscodes, max_workers=MAX_WORKERS):
+    """
+    Scrapes commodity-wise export data for the given list of HS codes.
+    
+    Pending (hscode, year, month) jobs are collected up front and fetched by
+    submitting the report form over HTTP (when aiohttp is installed). Jobs
+    that still need a browser are spread over a pool of headless Chrome
+    instances, one per worker thread.
+    
+    Args:
+        hscodes: List of 8-digit HS codes to scrape
+        max_workers: Number of parallel browser instances
+    """
+    start_year = 2018
+    now = datetime.datetime.now()
+    completed = load_completed_cache()
+
+    print(f"Processing {len(hscodes)} HS codes...\n")
+    jobs = build_jobs(hscodes, start_year, now, completed)
+    
+    if not jobs:
+        print("\nNothing to download.")
+    else:
+        _run_jobs(jobs, max_workers)
+        
+        # Record HS codes that have no gaps left after this run
+        for hscode in dict.fromkeys(hscode for hscode, _, _ in jobs):
+            if not missing_months(hscode, start_year, now, completed.get(hscode)):
+                completed[hscode] = month_key(now.year, now.month)
+    
+    save_completed_cache(completed)
+
+def _run_jobs(jobs, max_workers):
+    """Fetches the jobs over HTTP where possible, then with the browser pool."""
+    if aiohttp is not None:
+        print(f"\nFetching {len(jobs)} monthly reports over HTTP...\n")
+        try:
+            jobs = asyncio.run(fetch_all_reports(jobs))
+        except Exception as e:
+            print(f"  HTTP scraping failed ({e}); using the browser scraper.")
+        
+        if not jobs:
+            return
+    
+    print(f"\nDownloading {len(jobs)} monthly files with {max_workers} workers...\n")
+    
+    # Resolve the driver once here rather than racing in every worker
+    get_driver_path()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="worker") as executor:
+            # Consume results so worker exceptions are not silently dropped
+            for _ in executor.map(_download_job, jobs):
+                pass
 
     finally:
-        print("Closing driver...")
-        driver.quit()
+        print("Closing drivers...")
+        for driver, download_dir in _worker_drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"  Error closing driver: {e}")
+            try:
+                os.rmdir(download_dir)
+            except:
+                pass
+        _worker_drivers.clear()
         # Clean up temp dir if empty
         try:
             os.rmdir(TEMP_DOWNLOAD_DIR)
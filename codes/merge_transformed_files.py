@@ -1,8 +1,9 @@
 """
 Merge All Transformed Excel Files into One Consolidated File
 
-This script reads all individual HS code transformed Excel files from the
-Transformed directory and merges them into a single consolidated Excel file.
+This script reads the per-HS-code parquet shards (or, if none exist, all
+transformed Excel files) from the Transformed directory and merges them into
+a single consolidated Parquet file (optionally also written as Excel).
 
 Author: Auto-generated
 Date: 2025-12-30
@@ -11,63 +12,123 @@ Date: 2025-12-30
 import pandas as pd
 import os
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Rust-based calamine reader is much faster than openpyxl; fall back if it isn't installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
 
 # Configuration
 BASE_DIR = os.getcwd()
 TRANSFORMED_DIR = os.path.join(BASE_DIR, "data", "transformed")
 OUTPUT_FILE = os.path.join(TRANSFORMED_DIR, "consolidated_all_hscodes.xlsx")
+OUTPUT_PARQUET = OUTPUT_FILE.replace('.xlsx', '.parquet')
+# Per-HS-code parquet files written by the transform scripts (shards/import, shards/export)
+SHARDS_DIR = os.path.join(TRANSFORMED_DIR, "shards")
 
-def merge_excel_files():
-    """Merge all transformed Excel files into one consolidated file"""
+# Writing the consolidated workbook is slow; Parquet is the primary output
+WRITE_EXCEL_COPY = False
+
+CATEGORICAL_COLUMNS = ['HSCod', 'Commodity', 'Country', 'Type']
+
+EXPECTED_COLUMNS = ['HSCod', 'Commodity', 'Value', 'Country', 'Date', 'Type']
+
+
+def _read_one(filepath):
+    """
+    Read a single transformed Excel file (runs in a worker process)
     
-    print("="*80)
-    print("MERGING TRANSFORMED EXCEL FILES")
-    print("="*80)
-    print(f"\nSource directory: {TRANSFORMED_DIR}")
+    Returns: DataFrame, or None if the file is unreadable or misses expected columns
+    """
+    filename = os.path.basename(filepath)
+    try:
+        df = pd.read_excel(filepath, engine=EXCEL_ENGINE)
+    except Exception as e:
+        print(f"  ❌ Error reading {filename}: {e}")
+        return None
+    
+    # Verify expected columns exist
+    if not all(col in df.columns for col in EXPECTED_COLUMNS):
+        print(f"  ⚠️  Warning: Missing expected columns in {filename}, skipping...")
+        return None
+    
+    return df
+
+
+def _list_shards():
+    """Return all parquet shards written by the transform scripts"""
+    if not os.path.isdir(SHARDS_DIR):
+        return []
+    return [os.path.join(root, f)
+            for root, _, files in os.walk(SHARDS_DIR)
+            for f in files if f.endswith('.parquet')]
+
+
+def _read_excel_files():
+    """
+    Read all transformed Excel files in parallel
     
+    Returns: (combined DataFrame or None, processed_count, error_count)
+    """
     # Get all Excel files except the consolidated one
     excel_files = [f for f in os.listdir(TRANSFORMED_DIR) 
                    if f.endswith('.xlsx') and 'consolidated' not in f.lower()]
     
     if not excel_files:
         print("\n❌ No Excel files found to merge!")
-        return
+        return None, 0, 0
     
     print(f"\nFound {len(excel_files)} Excel files to merge")
     
     all_dataframes = []
-    total_records = 0
     processed_count = 0
     error_count = 0
     
-    # Read each Excel file
-    for idx, filename in enumerate(excel_files, 1):
-        filepath = os.path.join(TRANSFORMED_DIR, filename)
+    # Read all Excel files in parallel
+    filepaths = [os.path.join(TRANSFORMED_DIR, f) for f in excel_files]
+    with ProcessPoolExecutor() as executor:
+        frames = executor.map(_read_one, filepaths, chunksize=4)
         
-        try:
-            print(f"\n[{idx}/{len(excel_files)}] Reading: {filename}")
-            df = pd.read_excel(filepath)
-            
-            # Verify expected columns exist
-            expected_columns = ['HSCod', 'Commodity', 'Value', 'Country', 'Date', 'Type']
-            if not all(col in df.columns for col in expected_columns):
-                print(f"  ⚠️  Warning: Missing expected columns, skipping...")
+        for idx, (filename, df) in enumerate(zip(excel_files, frames), 1):
+            print(f"\n[{idx}/{len(excel_files)}] Read: {filename}")
+            if df is None:
                 error_count += 1
                 continue
             
-            records = len(df)
-            print(f"  ✓ Loaded {records:,} records")
+            print(f"  ✓ Loaded {len(df):,} records")
             
             all_dataframes.append(df)
-            total_records += records
             processed_count += 1
-            
-        except Exception as e:
-            print(f"  ❌ Error reading {filename}: {e}")
-            error_count += 1
-            continue
     
     if not all_dataframes:
+        return None, processed_count, error_count
+    
+    return pd.concat(all_dataframes, ignore_index=True), processed_count, error_count
+
+
+def merge_excel_files():
+    """Merge all transformed files into one consolidated file"""
+    
+    print("="*80)
+    print("MERGING TRANSFORMED EXCEL FILES")
+    print("="*80)
+    print(f"\nSource directory: {TRANSFORMED_DIR}")
+    
+    # Prefer the parquet shards: read them all in one shot instead of
+    # holding a list of per-file DataFrames in memory
+    shard_files = _list_shards()
+    if shard_files:
+        print(f"\nFound {len(shard_files)} parquet shards in {SHARDS_DIR}")
+        df_consolidated = pd.read_parquet(SHARDS_DIR)
+        processed_count = len(shard_files)
+        error_count = 0
+    else:
+        df_consolidated, processed_count, error_count = _read_excel_files()
+    
+    if df_consolidated is None:
         print("\n❌ No valid data to merge!")
         return
     
@@ -76,23 +137,33 @@ def merge_excel_files():
     print("CONSOLIDATING DATA")
     print("="*80)
     
-    df_consolidated = pd.concat(all_dataframes, ignore_index=True)
+    # Real dates sort chronologically ("Apr-2017" strings sort alphabetically);
+    # categorical keys make the grouping and sorting below much cheaper
+    df_consolidated['Date'] = pd.to_datetime(df_consolidated['Date'], format='%b-%Y')
+    df_consolidated = df_consolidated.astype({col: 'category' for col in CATEGORICAL_COLUMNS})
     
-    # Remove duplicates based on HSCod, Country, Date
+    # Remove duplicates based on HSCod, Type, Country, Date
+    # (an Import and an Export row for the same code/country/month are distinct)
     print(f"\nTotal records before deduplication: {len(df_consolidated):,}")
-    df_consolidated = df_consolidated.drop_duplicates(
-        subset=['HSCod', 'Country', 'Date'], 
-        keep='first'
-    )
+    df_consolidated = df_consolidated.groupby(
+        ['HSCod', 'Type', 'Country', 'Date'], sort=False, as_index=False, observed=True
+    ).first()
     print(f"Total records after deduplication: {len(df_consolidated):,}")
     
-    # Sort by HSCod, Date, Country
+    for trade_type, count in df_consolidated['Type'].value_counts().items():
+        if count:
+            print(f"  {trade_type}: {count:,} records")
+    
+    # Sort by HSCod, Type, Date, Country
     print("\nSorting data...")
-    df_consolidated = df_consolidated.sort_values(['HSCod', 'Date', 'Country'])
+    df_consolidated = df_consolidated.sort_values(['HSCod', 'Type', 'Date', 'Country'], kind='stable')
+    df_consolidated = df_consolidated[EXPECTED_COLUMNS]
     
     # Save consolidated file
     print(f"\nSaving consolidated file...")
-    df_consolidated.to_excel(OUTPUT_FILE, index=False)
+    df_consolidated.to_parquet(OUTPUT_PARQUET, compression='zstd', index=False)
+    if WRITE_EXCEL_COPY:
+        df_consolidated.to_excel(OUTPUT_FILE, index=False)
     
     # Summary statistics
     print("\n" + "="*80)
@@ -109,7 +180,9 @@ def merge_excel_files():
     print(f"  Value range: ${df_consolidated['Value'].min():.2f}M to ${df_consolidated['Value'].max():.2f}M")
     
     print(f"\n✅ Consolidated file saved to:")
-    print(f"   {OUTPUT_FILE}")
+    print(f"   {OUTPUT_PARQUET}")
+    if WRITE_EXCEL_COPY:
+        print(f"   {OUTPUT_FILE}")
     
     # Show breakdown by HS Code
     print(f"\n📈 Records per HS Code:")
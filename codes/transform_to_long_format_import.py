@@ -14,28 +14,42 @@ import os
 from pathlib import Path
 import re
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+# Rust-based calamine reader is much faster than openpyxl; fall back if it isn't installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
 
 # Configuration
 BASE_DIR = os.getcwd()
 DATA_DIR = os.path.join(BASE_DIR,"data","import")
 LOOKUP_FILE = os.path.join(BASE_DIR, "data","hscodes","cleaned_HS_Codes_for_processing.xlsx")
 OUTPUT_DIR = os.path.join(BASE_DIR, "data", "transformed")
+# One parquet file per HS code, read back together for the consolidated file
+SHARDS_DIR = os.path.join(OUTPUT_DIR, "shards", "import")
 
-# Create output directory if it doesn't exist
+# Create output directories if they don't exist
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+os.makedirs(SHARDS_DIR, exist_ok=True)
+
+# Header cells that never hold monthly values
+_NON_YEAR_COLUMNS = frozenset(['S.No.', 'Country', '(R)', '%Growth', 'nan', ''])
+
+# Matches year headers like "Apr-2017" or "Apr-Apr2017" -> (month, month2, year)
+_YEAR_COL_RE = re.compile(r'([A-Za-z]+)-?([A-Za-z]*)?(\d{4})')
 
 
 def load_hscode_lookup():
     """Load HS code to commodity name mapping"""
     print("Loading HS code lookup file...")
-    df_lookup = pd.read_excel(LOOKUP_FILE)
+    df_lookup = pd.read_excel(LOOKUP_FILE, engine=EXCEL_ENGINE)
     
     # Create mapping: HS Code -> Commodity Description
-    lookup_dict = {}
-    for _, row in df_lookup.iterrows():
-        hscode = str(row['Cleaned ITC Code']).strip()
-        description = row['Description']
-        lookup_dict[hscode] = description
+    lookup_dict = dict(zip(df_lookup['Cleaned ITC Code'].astype(str).str.strip(),
+                           df_lookup['Description']))
     
     print(f"Loaded {len(lookup_dict)} HS code mappings")
     return lookup_dict
@@ -54,12 +68,12 @@ def extract_year_columns(df_header_row):
         col_str = str(col_name).strip()
         
         # Skip non-year columns
-        if col_str in ['S.No.', 'Country', '(R)', '%Growth', 'nan', '']:
+        if col_str in _NON_YEAR_COLUMNS:
             continue
         
         # Match patterns like "Apr-2017", "Apr-Apr2017", etc.
         # Extract the month and year
-        match = re.search(r'([A-Za-z]+)-?([A-Za-z]*)?(\d{4})', col_str)
+        match = _YEAR_COL_RE.search(col_str)
         if match:
             month = match.group(1)
             year = match.group(3)
@@ -75,16 +89,16 @@ def process_monthly_file(filepath, hscode, commodity_name, data_type="Import"):
     Returns: DataFrame with columns [HSCod, Commodity, Value, Country, Date, Type]
     """
     try:
-        # Read the file without headers first
-        df_raw = pd.read_excel(filepath, header=None)
+        # Read the file without headers, skipping the first 2 rows (metadata)
+        df_raw = pd.read_excel(filepath, header=None, skiprows=2, engine=EXCEL_ENGINE)
         
-        # Skip first 2 rows (metadata), row 2 contains the actual headers
-        if len(df_raw) < 3:
+        # The first remaining row contains the actual headers
+        if len(df_raw) < 1:
             print(f"  Warning: File too short, skipping: {filepath}")
             return None
         
-        header_row = df_raw.iloc[2]  # Row index 2 (3rd row)
-        data_rows = df_raw.iloc[3:]  # Data starts from row 3 (4th row)
+        header_row = df_raw.iloc[0]  # 3rd row of the sheet
+        data_rows = df_raw.iloc[1:]  # Data starts from the 4th row
         
         # Extract year columns
         year_columns = extract_year_columns(header_row)
@@ -104,47 +118,35 @@ def process_monthly_file(filepath, hscode, commodity_name, data_type="Import"):
             print(f"  Warning: Country column not found in {filepath}")
             return None
         
-        # Transform to long format
-        long_data = []
+        # Transform to long format: keep Country + year columns, then melt
+        value_col_indices = [col_idx for col_idx, _, _, _ in year_columns]
+        df_wide = data_rows.iloc[:, [country_col_idx] + value_col_indices].copy()
+        # Name value columns by position; header labels can repeat (e.g. Apr-2017 / Apr-Apr2017)
+        df_wide.columns = ['Country'] + value_col_indices
         
-        for _, row in data_rows.iterrows():
-            country = str(row.iloc[country_col_idx]).strip()
-            
-            # Skip empty or invalid countries
-            if country in ['', 'nan', 'None']:
-                continue
-            
-            # Extract values for each year column
-            for col_idx, col_name, year, month in year_columns:
-                value = row.iloc[col_idx]
-                
-                # Skip if value is empty or invalid
-                if pd.isna(value) or value == '':
-                    continue
-                
-                # Convert value to float if possible
-                try:
-                    value_float = float(value)
-                except (ValueError, TypeError):
-                    continue
-                
-                # Create date string in format "MMM-YYYY"
-                date_str = f"{month}-{year}"
-                
-                # Add to long data
-                long_data.append({
-                    'HSCod': hscode,
-                    'Commodity': commodity_name,
-                    'Value': value_float,
-                    'Country': country,
-                    'Date': date_str,
-                    'Type': data_type
-                })
+        # Skip empty or invalid countries
+        df_wide['Country'] = df_wide['Country'].astype(str).str.strip()
+        df_wide = df_wide[~df_wide['Country'].isin(['', 'nan', 'None'])]
+        
+        df_long = df_wide.melt(id_vars='Country', var_name='ColIdx', value_name='Value')
         
-        if long_data:
-            return pd.DataFrame(long_data)
-        else:
+        # Skip empty or non-numeric values
+        df_long['Value'] = pd.to_numeric(df_long['Value'], errors='coerce')
+        df_long = df_long.dropna(subset=['Value'])
+        
+        if df_long.empty:
             return None
+        
+        # Create date string in format "MMM-YYYY"
+        date_by_col = {col_idx: f"{month}-{year}" for col_idx, _, year, month in year_columns}
+        df_long['Date'] = df_long['ColIdx'].map(date_by_col)
+        
+        # Constant columns as single-category categoricals (no per-row Python objects)
+        for col, value in (('HSCod', hscode), ('Commodity', commodity_name), ('Type', data_type)):
+            df_long[col] = pd.Series(value, index=df_long.index, dtype='category')
+        df_long['Country'] = df_long['Country'].astype('category')
+        
+        return df_long[['HSCod', 'Commodity', 'Value', 'Country', 'Date', 'Type']].reset_index(drop=True)
             
     except Exception as e:
         print(f"  Error processing {filepath}: {e}")
@@ -153,7 +155,8 @@ def process_monthly_file(filepath, hscode, commodity_name, data_type="Import"):
 
 def process_hscode_directory(hscode_dir, hscode, commodity_name):
     """
-    Process all monthly files for a single HS code
+    Process all monthly files for a single HS code and write them to a
+    parquet shard in SHARDS_DIR
     
     Returns: DataFrame with all data for this HS code
     """
@@ -180,8 +183,9 @@ def process_hscode_directory(hscode_dir, hscode, commodity_name):
         # Combine all data for this HS code
         df_combined = pd.concat(all_data, ignore_index=True)
         
-        # Remove duplicates (same HSCod, Country, Date combination)
-        df_combined = df_combined.drop_duplicates(subset=['HSCod', 'Country', 'Date'], keep='first')
+        # Duplicates (same HSCod, Country, Date) are removed once, globally, in main()
+        df_combined.to_parquet(os.path.join(SHARDS_DIR, f"{hscode}.parquet"),
+                               compression='zstd', index=False)
         
         print(f"  Total records for {hscode}: {len(df_combined)}")
         return df_combined
@@ -190,6 +194,31 @@ def process_hscode_directory(hscode_dir, hscode, commodity_name):
         return None
 
 
+# HS code lookup, set in each worker process by _init_worker
+_hscode_lookup = {}
+
+
+def _init_worker(hscode_lookup):
+    """Process pool initializer: share the HS code lookup with the worker"""
+    global _hscode_lookup
+    _hscode_lookup = hscode_lookup
+
+
+def _process_hscode_task(task):
+    """
+    Process pool task: process one (hscode_dir, hscode) pair
+    
+    Returns: Number of records written, or None if nothing was extracted
+    """
+    hscode_path, hscode = task
+    
+    # Get commodity name from lookup
+    commodity_name = _hscode_lookup.get(hscode, f"Unknown Commodity ({hscode})")
+    
+    df_hscode = process_hscode_directory(hscode_path, hscode, commodity_name)
+    return None if df_hscode is None else len(df_hscode)
+
+
 def main():
     """Main transformation process"""
     print("="*80)
@@ -206,36 +235,36 @@ def main():
     
     print(f"\nFound {len(hscode_dirs)} HS code directories")
     
-    all_transformed_data = []
+    # Remove shards from earlier runs so deleted HS codes don't linger
+    for name in os.listdir(SHARDS_DIR):
+        if name.endswith('.parquet'):
+            os.remove(os.path.join(SHARDS_DIR, name))
+    
     processed_count = 0
     skipped_count = 0
     
-    for hscode_dir_name in hscode_dirs:
-        hscode = hscode_dir_name
-        hscode_path = os.path.join(DATA_DIR, hscode_dir_name)
-        
-        # Get commodity name from lookup
-        commodity_name = hscode_lookup.get(hscode, f"Unknown Commodity ({hscode})")
-        
-        # Process this HS code directory
-        df_hscode = process_hscode_directory(hscode_path, hscode, commodity_name)
-        
-        if df_hscode is not None:
-            all_transformed_data.append(df_hscode)
-            processed_count += 1
-            
-            # Save individual HS code file
-            
-        else:
-            skipped_count += 1
+    # Process HS code directories in parallel; each worker writes its own shard
+    tasks = [(os.path.join(DATA_DIR, d), d) for d in hscode_dirs]
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(hscode_lookup,)) as executor:
+        for record_count in executor.map(_process_hscode_task, tasks):
+            # The data is already saved as a shard; only the count comes back
+            if record_count is not None:
+                processed_count += 1
+            else:
+                skipped_count += 1
     
-    # Combine all data and save consolidated file
-    if all_transformed_data:
+    # Combine all shards and save consolidated file
+    if processed_count:
         print("\n" + "="*80)
         print("CREATING CONSOLIDATED FILE")
         print("="*80)
         
-        df_consolidated = pd.concat(all_transformed_data, ignore_index=True)
+        df_consolidated = pd.read_parquet(SHARDS_DIR)
+        
+        # Remove duplicates (same HSCod, Country, Date combination)
+        df_consolidated = df_consolidated.groupby(
+            ['HSCod', 'Country', 'Date'], sort=False, as_index=False, observed=True
+        ).first()[['HSCod', 'Commodity', 'Value', 'Country', 'Date', 'Type']]
         
         # Sort by HSCod, Date, Country
         df_consolidated = df_consolidated.sort_values(['HSCod', 'Date', 'Country'])
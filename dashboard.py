@@ -1,17 +1,14 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-from datetime import timedelta
-from math import sqrt
-from sklearn.metrics import mean_squared_error
 import numpy as np
 import warnings
 import os
 warnings.filterwarnings("ignore")
 
+# Shared input paths and cached Excel readers (also used by scripts/)
+from data_io import base_file, base_parquet, mapping_file, read_cached
+
 # ==========================================
 # 1. PAGE SETUP
 # ==========================================
@@ -19,79 +16,199 @@ st.set_page_config(page_title="Critical Mineral Dashboard", layout="wide")
 st.title("Indian Critical Mineral Intelligence Dashboard ($)")
 st.caption("Granularity: Month-Wise | Data Cutoff: September 2025")
 
-# CONFIGURATION (Your specific paths)
-curr_dir= os.getcwd()
-base_file = os.path.join(curr_dir, "data", "transformed", "consolidated_all_hscodes.xlsx")
-mapping_file = os.path.join(curr_dir, "data", "hscodes", "cleaned_HS_Codes_for_processing.xlsx")
-
 # ==========================================
 # 2. DATA LOADING
 # ==========================================
-@st.cache_data
+# Columns of the consolidated file the dashboard actually uses
+BASE_COLUMNS = ('HSCode', 'Type', 'Value', 'Date')
+
+# The mapping is small and static: keep it as a live object across reruns
+# rather than rebuilding (and re-hashing) it on every data-cache miss
+@st.cache_resource
+def get_hs_map():
+    # Only the two columns used below are loaded (names may carry stray spaces)
+    map_df = read_cached(mapping_file, usecols=lambda c: str(c).strip() in ('HSCode', 'Element respective'))
+    map_df = map_df.rename(columns=lambda c: str(c).strip())
+    
+    # Check if required columns exist in mapping file
+    if 'HSCode' not in map_df.columns:
+        raise KeyError(f"'HSCode' column not found in mapping file. Available columns: {list(map_df.columns)}")
+    if 'Element respective' not in map_df.columns:
+        raise KeyError(f"'Element respective' column not found in mapping file. Available columns: {list(map_df.columns)}")
+    
+    # Compare codes as strings; Excel stores them as numbers, Parquet as text.
+    # Indexed Series so the codes are hashed once; a repeated code keeps its
+    # last mineral
+    mapping = map_df.set_index(map_df['HSCode'].astype(str))['Element respective']
+    return mapping[~mapping.index.duplicated(keep='last')]
+
+@st.cache_data(ttl=3600)
 def load_data():
     try:
         # Load Main Data
-        df = pd.read_excel(base_file)
-        df['Date_Parsed'] = pd.to_datetime(df['Date'], format='%b-%Y')
+        if os.path.exists(base_parquet):
+            # The pipeline names the code column 'HSCod'
+            df = pd.read_parquet(base_parquet, columns=['HSCod', 'Type', 'Value', 'Date'])
+            df = df.rename(columns={'HSCod': 'HSCode'})
+        else:
+            # Only the columns used below are loaded from the sidecar
+            df = read_cached(base_file, usecols=lambda c: c in BASE_COLUMNS)
+        
+        # Check the required columns exist in base file before touching them
+        for col in BASE_COLUMNS:
+            if col not in df.columns:
+                raise KeyError(f"'{col}' column not found in base data file. Available columns: {list(df.columns)}")
+        
+        # calamine can hand back mixed-type cells; normalise the key columns.
+        # Categorical keys turn filters/groupbys into integer-code operations
+        df['Value'] = pd.to_numeric(df['Value'], errors='coerce')
+        df['HSCode'] = df['HSCode'].astype(str).astype('category')
+        df['Type'] = df['Type'].astype('category')
+        # Cells typed as dates arrive as datetimes already; 'Apr-2017' strings
+        # repeat once per month, so memoise the parse
+        if pd.api.types.is_datetime64_any_dtype(df['Date']):
+            df['Date_Parsed'] = df['Date']
+        else:
+            df['Date_Parsed'] = pd.to_datetime(df['Date'], format='%b-%Y', cache=True)
         
         # --- CUTOFF FILTER (Sept 2025) ---
         df = df[df['Date_Parsed'] <= "2025-09-30"]
         
         # Load Mapping
-        map_df = pd.read_excel(mapping_file)
-        map_df.columns = map_df.columns.str.strip()
-        
-        # Check if required columns exist in mapping file
-        if 'HSCode' not in map_df.columns:
-            raise KeyError(f"'HSCode' column not found in mapping file. Available columns: {list(map_df.columns)}")
-        if 'Element respective' not in map_df.columns:
-            raise KeyError(f"'Element respective' column not found in mapping file. Available columns: {list(map_df.columns)}")
-        
-        hs_code_map = dict(zip(map_df['HSCode'], map_df['Element respective']))
+        hs_code_map = get_hs_map()
         
-        # Check if HSCode column exists in base file
-        if 'HSCode' not in df.columns:
-            raise KeyError(f"'HSCode' column not found in base data file. Available columns: {list(df.columns)}")
+        # Apply Map: encode codes against the mapping keys and gather the
+        # minerals by category code (-1 marks codes missing from the mapping)
+        codes = df['HSCode'].cat.set_categories(hs_code_map.index).cat.codes.to_numpy()
+        minerals = hs_code_map.to_numpy(dtype=object)
+        keep = codes != -1
+        keep[keep] = pd.notna(minerals[codes[keep]])
+        df = df[keep].copy()
+        df['Mineral'] = pd.Categorical(minerals[codes[keep]])
         
-        # Apply Map
-        df['Mineral'] = df['HSCode'].map(hs_code_map)
-        df = df[df['Mineral'].notna()]
+        # Month-wise Import/Export totals per mineral, computed once here so a
+        # sidebar change is a slice instead of two resample passes
+        sums = df.groupby(['Mineral', 'Type', pd.Grouper(key='Date_Parsed', freq='MS')], observed=True)['Value'].sum()
+        # Fill missing months with 0 over each (mineral, type)'s own date span,
+        # so a type never gets zeros before its first or after its last month
+        if not sums.empty:
+            sums = pd.concat(
+                {key: g.droplevel(['Mineral', 'Type']).reindex(pd.date_range(g.index.get_level_values('Date_Parsed').min(),
+                                                                             g.index.get_level_values('Date_Parsed').max(), freq='MS'),
+                                                               fill_value=0)
+                 for key, g in sums.groupby(level=['Mineral', 'Type'], observed=True)},
+                names=['Mineral', 'Type', 'Date_Parsed'])
+        # Import/Export columns; NaN outside a type's span (or for a missing type)
+        monthly = sums.unstack('Type')
+        monthly.columns = monthly.columns.astype(str)
+        monthly = monthly.reindex(columns=['Import', 'Export'])
         
-        return df.sort_values('Date_Parsed')
+        # Only the mineral list and the monthly table are cached: the UI reads
+        # nothing else, so the row-level frame is not pickled on every rerun
+        return list(df['Mineral'].cat.categories), monthly
     except KeyError as e:
         st.error(f"Column Error: {e}")
         st.info(f"Base file: {base_file}")
         st.info(f"Mapping file: {mapping_file}")
-        return pd.DataFrame()
+        return [], pd.DataFrame()
     except Exception as e:
         st.error(f"Error loading files: {e}")
         st.info(f"Base file: {base_file}")
         st.info(f"Mapping file: {mapping_file}")
         import traceback
         st.code(traceback.format_exc())
-        return pd.DataFrame()
+        return [], pd.DataFrame()
 
-df = load_data()
+# Numba is only imported (and _score compiled, or loaded from its on-disk
+# cache) the first time a tournament actually has to run
+@st.cache_resource(show_spinner=False)
+def _get_scorer():
+    from numba import njit
+    
+    @njit(cache=True)
+    def _score(t, p):
+        """Holdout (RMSE, MAPE %) in one pass; MAPE skips zero actuals (0.0 if all are zero)."""
+        se = 0.0
+        ape = 0.0
+        n = 0
+        for i in range(t.size):
+            e = t[i] - p[i]
+            se += e * e
+            if t[i] != 0:
+                ape += abs(e / t[i])
+                n += 1
+        rmse = (se / t.size) ** 0.5
+        mape = 100.0 * ape / n if n else 0.0
+        return rmse, mape
+    
+    return _score
+
+# Cached as a live object so results are never hashed on return; revisiting
+# a mineral skips all four model fits
+@st.cache_resource(show_spinner=False)
+def run_tournament(key, series_bytes):
+    """
+    Fits both models once on the full series, scores each on its in-sample
+    one-step-ahead fit over the last 6 months, and keeps the 12-month forecast
+    of the one with the lower RMSE. key (mineral, length) only labels the
+    cache entry; the series bytes (float32) identify the data.
+    
+    Returns (winner, rmse, mape, 12-month forecast).
+    """
+    # Heavy imports, paid only when a tournament actually has to run
+    from statsforecast.models import AutoARIMA, AutoETS
+    _score = _get_scorer()
+    
+    # float32 keeps the cache key compact; the models compute (and return)
+    # float64 regardless
+    y = np.frombuffer(series_bytes, dtype=np.float32)
+    
+    # 1. Holdout = last 6 months, scored from the same fit that forecasts
+    test = y[-6:].astype(np.float64)
+    
+    candidates = {
+        # --- MODEL A: ARIMA ---
+        "AutoARIMA": AutoARIMA(season_length=12),
+        # --- MODEL B: HOLT-WINTERS ---
+        "Holt-Winters (AutoETS, damped)": AutoETS(season_length=12, model='ZZN', damped=True),
+    }
+    results = {}
+    for name, model in candidates.items():
+        try:
+            res = model.forecast(y=y, h=12, fitted=True)
+            rmse, mape = _score(test, np.asarray(res['fitted'][-6:], dtype=np.float64))
+            if not np.isfinite(rmse):
+                rmse, mape = float('inf'), float('inf')
+            results[name] = (rmse, mape, res['mean'])
+        except:
+            results[name] = (float('inf'), float('inf'), None)
+    
+    # 2. Pick Winner (no refit needed: its forecast already uses the full data)
+    # 3. Its MAPE was scored alongside the RMSE
+    winner = min(results, key=lambda name: results[name][0])
+    error_score, mape, forecast = results[winner]
+    
+    return winner, error_score, mape, forecast
+
+mineral_list, monthly = load_data()
 
 # Add cache clear button for debugging
 if st.sidebar.button("🔄 Clear Cache & Reload Data"):
     st.cache_data.clear()
+    get_hs_map.clear()
     st.rerun()
 
-if not df.empty:
+if mineral_list:
     # ==========================================
     # 3. SIDEBAR CONTROLS
     # ==========================================
     st.sidebar.header("Filters")
-    mineral = st.sidebar.selectbox("Select Mineral", df['Mineral'].unique())
+    mineral = st.sidebar.selectbox("Select Mineral", mineral_list)
 
-    # Filter Data for Selection
-    mineral_df = df[df['Mineral'] == mineral]
-    
-    # Enforce Month-Wise Granularity (Sum duplicates, fill missing months with 0)
+    # Month-wise series for the selection (sum duplicates, missing months are 0)
     # This ensures we have a continuous monthly timeline
-    monthly_import = mineral_df[mineral_df['Type'] == 'Import'].set_index('Date_Parsed')['Value'].resample('MS').sum().fillna(0)
-    monthly_export = mineral_df[mineral_df['Type'] == 'Export'].set_index('Date_Parsed')['Value'].resample('MS').sum().fillna(0)
+    mi = monthly.xs(mineral)
+    monthly_import, monthly_export = mi['Import'].dropna(), mi['Export'].dropna()
 
     # ==========================================
     # 4. MAIN TABS
@@ -103,8 +220,9 @@ if not df.empty:
         st.subheader(f"{mineral} Trade Overview")
         
         # Top Level Metrics
-        imp_total = monthly_import.sum()
-        exp_total = monthly_export.sum()
+        # One reduction over both columns of the monthly table
+        totals = mi.sum()
+        imp_total, exp_total = totals['Import'], totals['Export']
         dep_ratio = (imp_total / (imp_total + exp_total)) * 100 if (imp_total + exp_total) > 0 else 0
         
         c1, c2, c3 = st.columns(3)
@@ -112,13 +230,15 @@ if not df.empty:
         c2.metric("Total Exports", f"$ {exp_total:,.0f} Millions")
         c3.metric("Dependency Ratio", f"{dep_ratio:.1f}%", help="Imports / Total Trade")
         
-        # Combined Plot
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=monthly_import.index, y=monthly_import, mode='lines+markers', name='Imports', line=dict(color='blue')))
-        fig.add_trace(go.Scatter(x=monthly_export.index, y=monthly_export, mode='lines+markers', name='Exports', line=dict(color='orange')))
+        # Combined Plot (long form, so the figure is built in one validated pass)
+        trade_long = (mi.rename(columns={'Import': 'Imports', 'Export': 'Exports'})
+                        .rename_axis(index='Date', columns='Trade')
+                        .stack().rename('Value').reset_index())
+        fig = px.line(trade_long, x='Date', y='Value', color='Trade', markers=True,
+                      color_discrete_map={'Imports': 'blue', 'Exports': 'orange'},
+                      title=f"Month-Wise Trade Trends ({mineral})")
         
-        fig.update_layout(title=f"Month-Wise Trade Trends ({mineral})", 
-                          xaxis_title="Date", yaxis_title="Value Millions (USD $)", hovermode="x unified")
+        fig.update_layout(yaxis_title="Value Millions (USD $)", legend_title_text=None, hovermode="x unified")
         st.plotly_chart(fig, use_container_width=True)
 
     # --- TAB 2: MONTHLY DATA TABLE ---
@@ -136,11 +256,14 @@ if not df.empty:
         combined_df['Net Trade Balance'] = combined_df['Exports Million ($)'] - combined_df['Imports Million ($)']
         
         # Sort newest first
-        st.dataframe(combined_df.sort_index(ascending=False).style.format("$ {:,.0f}"), use_container_width=True)
+        # Formatted client-side; the Styler would format every cell in Python
+        st.dataframe(combined_df.sort_index(ascending=False), use_container_width=True,
+                     column_config={c: st.column_config.NumberColumn(format="dollar") for c in combined_df.columns})
         
-        # Download Option
-        csv = combined_df.to_csv().encode('utf-8')
-        st.download_button("Download Monthly Data (CSV)", csv, f"{mineral}_monthly_data.csv", "text/csv")
+        # Download Option (the CSV is only built once the user asks for it)
+        if st.button("Prepare CSV"):
+            csv = combined_df.to_csv(sep=',', lineterminator='\n').encode('utf-8')
+            st.download_button("Download Monthly Data (CSV)", csv, f"{mineral}_monthly_data.csv", "text/csv")
 
     # --- TAB 3: AI FORECASTING (CHAMPION/CHALLENGER) ---
     with tab3:
@@ -149,55 +272,8 @@ if not df.empty:
         
         if len(monthly_import) > 12:
             with st.spinner("Running Model Tournament..."):
-                # 1. Split Train/Test (Hidden 6 months)
-                train = monthly_import[:-6]
-                test = monthly_import[-6:]
-                
-                # --- MODEL A: ARIMA ---
-                try:
-                    model_a = ARIMA(train, order=(5,1,0))
-                    fit_a = model_a.fit()
-                    pred_a = fit_a.forecast(steps=6)
-                    rmse_a = sqrt(mean_squared_error(test, pred_a))
-                except:
-                    rmse_a = float('inf')
-
-                # --- MODEL B: HOLT-WINTERS ---
-                try:
-                    model_b = ExponentialSmoothing(train, trend='add', seasonal=None, damped_trend=True)
-                    fit_b = model_b.fit()
-                    pred_b = fit_b.forecast(steps=6)
-                    rmse_b = sqrt(mean_squared_error(test, pred_b))
-                except:
-                    rmse_b = float('inf')
-                
-                # 2. Pick Winner & Retrain on FULL Data
-                if rmse_a < rmse_b:
-                    winner = "ARIMA (5,1,0)"
-                    error_score = rmse_a
-                    
-                    final_model = ARIMA(monthly_import, order=(5,1,0))
-                    final_fit = final_model.fit()
-                    forecast = final_fit.forecast(steps=12)
-                else:
-                    winner = "Holt-Winters (Exp. Smoothing)"
-                    error_score = rmse_b
-                    
-                    final_model = ExponentialSmoothing(monthly_import, trend='add', seasonal=None, damped_trend=True)
-                    final_fit = final_model.fit()
-                    forecast = final_fit.forecast(steps=12)
-
-                # 3. Calculate MAPE
-                non_zero_test = test[test != 0]
-                # We need the predictions from the winning model for the test period to calculate MAPE correctly
-                if winner == "ARIMA (5,1,0)":
-                    winner_test_preds = pred_a
-                else:
-                    winner_test_preds = pred_b
-                    
-                non_zero_pred = winner_test_preds[test != 0]
-                
-                mape = (abs((non_zero_test - non_zero_pred) / non_zero_test).mean()) * 100 if len(non_zero_test) > 0 else 0.0
+                winner, error_score, mape, forecast = run_tournament(
+                    (mineral, len(monthly_import)), monthly_import.to_numpy(dtype=np.float32).tobytes())
 
             # 4. Display Results
             col_res1, col_res2, col_res3 = st.columns(3)
@@ -206,15 +282,19 @@ if not df.empty:
             col_res3.metric("MAPE (Error %)", f"{mape:.2f}%")
             
             # 5. Plot Forecast
-            future_dates = [monthly_import.index[-1] + timedelta(days=30*i) for i in range(1, 13)]
+            future_dates = pd.date_range(monthly_import.index[-1] + pd.offsets.MonthBegin(1), periods=12, freq='MS')
             
-            fig2 = go.Figure()
-            # Historical Data
-            fig2.add_trace(go.Scatter(x=monthly_import.index, y=monthly_import, mode='lines', name='Historical', line=dict(color='gray')))
-            # Forecast Data
-            fig2.add_trace(go.Scatter(x=future_dates, y=forecast, mode='lines+markers', name='Forecast', line=dict(color='green', width=3)))
+            # Historical + Forecast Data in one long frame
+            forecast_long = pd.concat([
+                pd.DataFrame({'Date': monthly_import.index, 'Value': monthly_import.to_numpy(), 'Kind': 'Historical'}),
+                pd.DataFrame({'Date': future_dates, 'Value': forecast, 'Kind': 'Forecast'}),
+            ], ignore_index=True)
+            fig2 = px.line(forecast_long, x='Date', y='Value', color='Kind',
+                           color_discrete_map={'Historical': 'gray', 'Forecast': 'green'},
+                           title=f"AI Prediction for {mineral} (Next 12 Months)")
+            fig2.update_traces(selector=dict(name='Forecast'), mode='lines+markers', line_width=3)
             
-            fig2.update_layout(title=f"AI Prediction for {mineral} (Next 12 Months)", yaxis_title="Imports Million (USD $)")
+            fig2.update_layout(yaxis_title="Imports Million (USD $)", legend_title_text=None)
             st.plotly_chart(fig2, use_container_width=True)
             
         else:
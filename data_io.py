@@ -0,0 +1,56 @@
+"""
+Shared input paths and Excel readers for the dashboard and the debug scripts
+in scripts/, so there is a single read_excel implementation to tune.
+"""
+import os
+import glob
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Rust-based reader is much faster than openpyxl; fall back when not installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+# CONFIGURATION (Your specific paths)
+curr_dir = os.getcwd()
+base_file = os.path.join(curr_dir, "data", "transformed", "consolidated_all_hscodes.xlsx")
+# Written by merge_transformed_files.py; preferred over the Excel file when present
+base_parquet = base_file.replace(".xlsx", ".parquet")
+mapping_file = os.path.join(curr_dir, "data", "hscodes", "cleaned_HS_Codes_for_processing.xlsx")
+
+def read_excel(path, usecols=None):
+    """Reads an Excel file with the fastest available engine."""
+    return pd.read_excel(path, engine=EXCEL_ENGINE, usecols=usecols)
+
+def _selected_columns(columns, usecols):
+    """Applies a read_excel-style usecols (list or callable) to known column names."""
+    if usecols is None:
+        return list(columns)
+    if callable(usecols):
+        return [c for c in columns if usecols(c)]
+    return [c for c in columns if c in usecols]
+
+def read_cached(path, usecols=None):
+    """
+    Reads an Excel file through a Parquet sidecar keyed on its mtime.
+    The sidecar always holds the full sheet; usecols is applied when it is
+    read, so callers with different selections can share one sidecar.
+    """
+    cache = path + f".{os.path.getmtime(path):.0f}.full.parquet"
+    if os.path.exists(cache):
+        columns = _selected_columns(pq.read_schema(cache).names, usecols)
+        return pd.read_parquet(cache, columns=columns)
+    
+    df = read_excel(path)
+    try:
+        # Sidecars of older versions of the file are stale now
+        for old in glob.glob(glob.escape(path) + ".*.parquet"):
+            os.remove(old)
+        df.to_parquet(cache, compression="zstd", index=False)
+    except Exception:
+        # Caching is an optimisation only (e.g. mixed-type columns, read-only dir)
+        pass
+    return df if usecols is None else df[_selected_columns(df.columns, usecols)].copy()
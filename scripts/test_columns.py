@@ -0,0 +1,17 @@
+from data_io import mapping_file, read_excel
+
+if __name__ == "__main__":
+    map_df = read_excel(mapping_file)
+    
+    print("Original columns:")
+    for i, col in enumerate(map_df.columns):
+        print(f"{i}: {repr(col)}")
+    
+    map_df.columns = map_df.columns.str.strip()
+    
+    print("\nAfter strip:")
+    for i, col in enumerate(map_df.columns):
+        print(f"{i}: {repr(col)}")
+    
+    print("\nFirst few rows:")
+    print(map_df.head())
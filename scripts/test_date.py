@@ -0,0 +1,21 @@
+import pandas as pd
+from data_io import base_file, read_excel
+
+if __name__ == "__main__":
+    # Load Main Data
+    print("Loading base file...")
+    df = read_excel(base_file)
+    
+    print(f"\nColumn names (repr):")
+    for col in df.columns:
+        print(f"  {repr(col)}")
+    
+    print(f"\nTrying to parse Date column...")
+    try:
+        df['Date_Parsed'] = pd.to_datetime(df['Date'], format='%b-%Y')
+        print("SUCCESS: Date parsing worked")
+        print(f"Sample dates: {df['Date_Parsed'].head()}")
+    except Exception as e:
+        print(f"ERROR: {e}")
+        print(f"\nSample Date values:")
+        print(df['Date'].head(20))
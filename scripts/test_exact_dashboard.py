@@ -1,16 +1,12 @@
 import pandas as pd
-import os
+from data_io import base_file, mapping_file, read_excel
 
 # Mimic Streamlit's caching behavior
 def load_data():
-    curr_dir = os.getcwd()
-    base_file = os.path.join(curr_dir, "data", "transformed", "consolidated_all_hscodes.xlsx")
-    mapping_file = os.path.join(curr_dir, "data", "hscodes", "cleaned_HS_Codes_for_processing.xlsx")
-    
     try:
         # Load Main Data
         print(base_file)
-        df = pd.read_excel(base_file)
+        df = read_excel(base_file)
         df['Date_Parsed'] = pd.to_datetime(df['Date'], format='%b-%Y')
         print("failed base file load")  # This is line 37 - misleading message!
         
@@ -18,7 +14,7 @@ def load_data():
         df = df[df['Date_Parsed'] <= "2025-09-30"]
         
         # Load Mapping
-        map_df = pd.read_excel(mapping_file)
+        map_df = read_excel(mapping_file)
         map_df.columns = map_df.columns.str.strip()
         
         print(f"\nMapping file columns after strip:")
@@ -49,16 +45,17 @@ def load_data():
         traceback.print_exc()
         return pd.DataFrame()
 
-# Call the function
-print("=" * 60)
-print("TESTING LOAD_DATA FUNCTION")
-print("=" * 60)
-df = load_data()
-
-if not df.empty:
-    print(f"\n✓ SUCCESS!")
-    print(f"Data shape: {df.shape}")
-    print(f"Columns: {df.columns.tolist()}")
-    print(f"Unique minerals: {df['Mineral'].nunique()}")
-else:
-    print(f"\n✗ FAILED - Empty DataFrame returned")
+if __name__ == "__main__":
+    # Call the function
+    print("=" * 60)
+    print("TESTING LOAD_DATA FUNCTION")
+    print("=" * 60)
+    df = load_data()
+    
+    if not df.empty:
+        print(f"\n✓ SUCCESS!")
+        print(f"Data shape: {df.shape}")
+        print(f"Columns: {df.columns.tolist()}")
+        print(f"Unique minerals: {df['Mineral'].nunique()}")
+    else:
+        print(f"\n✗ FAILED - Empty DataFrame returned")